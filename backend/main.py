@@ -1,22 +1,31 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import List, Optional, Dict
-import uvicorn
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import logging
 import os
-import uuid
+import re
 import tempfile
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
 from datetime import datetime
-from ai_service import PresentaionAi
-import document_processor
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import List, Optional, Dict
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-import asyncio
-from fastapi.responses import StreamingResponse
-import io
-import base64
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, ConfigDict
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
@@ -25,10 +34,12 @@ from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
-import tempfile
-import requests
 from PIL import Image
-import urllib.parse
+
+import document_processor
+from ai_service import PresentaionAi
+
+logger = logging.getLogger("presentation_ai")
 
 class UrlIngestRequest(BaseModel):
     url: str
@@ -44,10 +55,27 @@ class OutlineToSlidesRequest(BaseModel):
     outline: dict
 
 
+# orjson serializes the slide-heavy payloads several times faster than the
+# stdlib json used by the default JSONResponse. Optional, like in ai_service.
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+except ImportError:
+    orjson = None
+    from fastapi.responses import JSONResponse as _DefaultResponse
+
+
+def _ndjson_line(obj) -> bytes:
+    """Serialize one object as an NDJSON line"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj) + "\n").encode()
+
 app = FastAPI(
     title="Presentation AI API",
     description="AI-powered presentation generator API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=_DefaultResponse
 )
 
 # CORS middleware
@@ -59,8 +87,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Paths whose responses must reach the client chunk by chunk: gzip buffers
+# small writes inside zlib, so compressing the NDJSON stream would hold
+# every slide line back until the generator finishes.
+_UNCOMPRESSED_PATHS = frozenset({"/api/generate-presentation/stream"})
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves streaming endpoints uncompressed."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in _UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Slide-heavy JSON compresses 3-5x; level 5 keeps the CPU cost negligible.
+# Small responses (health checks, errors) skip compression entirely.
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles with far-future caching for fingerprinted assets.
+
+    Everything served this way is content-addressed (hashed bundle names
+    from the frontend build, content-hash PNGs from ai_service), so a new
+    version always gets a new URL and clients/CDNs may cache forever.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+# Serve content-addressed chart/image PNGs written by ai_service
+GENERATED_MEDIA_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "static", "generated"
+)
+os.makedirs(GENERATED_MEDIA_DIR, exist_ok=True)
+app.mount("/static/generated", ImmutableStaticFiles(directory=GENERATED_MEDIA_DIR), name="generated-media")
+
 # Pydantic models
 class SlideRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     prompt: Optional[str] = None
     type: Optional[str] = None
     title: Optional[str] = None
@@ -73,12 +145,16 @@ class SlideRequest(BaseModel):
 
 
 class PresentationRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     title: str
     description: str
     slides: List[SlideRequest]
     theme: str = "modern"
 
 class GeneratePresentationRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     prompt: str
     model: Optional[str] = None
     theme: Optional[str] = None
@@ -111,14 +187,199 @@ class CreateThemeRequest(BaseModel):
     image_style_keywords: List[str] = []
 
 class PresentationResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     title: str
     description: str
     slides: List[SlideRequest]
     theme: str
 
+
 # AI service instance
 ai_service = PresentaionAi()
 
+# Snapshot of the processor's extension set, frozen and pre-lowered, with
+# the "unsupported format" detail string built once instead of joined on
+# every rejected upload
+_SUPPORTED_EXTS = frozenset(e.lower() for e in document_processor.supported_formats)
+_SUPPORTED_EXTS_DETAIL = f"Unsupported file format. Supported: {', '.join(sorted(_SUPPORTED_EXTS))}"
+
+
+class MicroBatcher:
+    """Micro-batches payloads across concurrent requests.
+
+    Payloads arriving within a short window (or until max_batch) are
+    dispatched together through the runner, so bursts from simultaneous
+    users share scheduling overhead instead of trickling upstream one
+    call at a time. The runner takes a list of payloads and returns one
+    result (or exception) per payload.
+    """
+
+    def __init__(self, runner, window: float = 0.025, max_batch: int = 8):
+        self._runner = runner
+        self._window = window
+        self._max_batch = max_batch
+        self._queue = []  # (payload, future)
+        self._timer = None
+
+    async def submit(self, payload):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((payload, future))
+        if len(self._queue) >= self._max_batch:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return await future
+
+    def _flush(self):
+        self._timer = None
+        batch = self._queue[:self._max_batch]
+        self._queue = self._queue[self._max_batch:]
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+        if self._queue:
+            # More than one batch queued up — keep draining
+            asyncio.get_event_loop().call_soon(self._flush)
+
+    async def _run(self, batch):
+        try:
+            results = await self._runner([p for p, _ in batch])
+        except BaseException as e:
+            # A runner-level failure (or cancellation at shutdown) must fail
+            # every queued future, or the callers await forever.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        # zip truncates silently — a runner that returned too few results
+        # would otherwise leave the tail of the batch pending.
+        for _, future in batch[len(results):]:
+            if not future.done():
+                future.set_exception(
+                    RuntimeError("batch runner returned fewer results than payloads")
+                )
+
+
+async def _run_slide_batch(payloads):
+    """Dispatch a batch of (prompt, model, theme) slide generations.
+
+    OpenRouter has no multi-completion endpoint for this call shape, so
+    the batch fans out in one gather over the shared client.
+    """
+    return await asyncio.gather(
+        *(ai_service.generate_slide_from_prompt(p, m, t) for p, m, t in payloads),
+        return_exceptions=True
+    )
+
+
+image_batcher = MicroBatcher(ai_service.generate_images_batch)
+slide_batcher = MicroBatcher(_run_slide_batch, window=0.05)
+
+# Prompt-hash → image URL cache: regenerated decks and templated fallback
+# prompts repeat often, and a hit skips the provider round-trip entirely.
+# (Concurrent duplicates already coalesce inside ai_service.)
+_IMAGE_CACHE: Dict[str, str] = {}
+_IMAGE_CACHE_MAX = 4096
+
+
+async def cached_generate_image(prompt: str) -> str:
+    key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+    hit = _IMAGE_CACHE.get(key)
+    if hit:
+        return hit
+    image_url = await image_batcher.submit(prompt)
+    if image_url:
+        if len(_IMAGE_CACHE) >= _IMAGE_CACHE_MAX:
+            _IMAGE_CACHE.pop(next(iter(_IMAGE_CACHE)))
+        _IMAGE_CACHE[key] = image_url
+    return image_url
+
+async def _ensure_slide_images(slides: list) -> None:
+    """Fill in missing imageUrl fields for a list of slide dicts in place.
+
+    Prompts for all missing images are dispatched in one gather (each call
+    already goes through the prompt cache and the micro-batcher), and any
+    failure or empty result falls back to a keyword stock photo.
+    """
+    jobs = [
+        (idx, slide.get("imagePrompt")
+         or f"Professional presentation slide: {slide.get('title', '')}. {slide.get('content', '')[:100]}")
+        for idx, slide in enumerate(slides)
+        if not slide.get("imageUrl")
+    ]
+    if not jobs:
+        return
+    # Templated slides ("Key Point 1/2/3...") often repeat the same prompt;
+    # generate each unique prompt once and fan the result back out
+    unique = list(dict.fromkeys(p for _, p in jobs))
+    unique_results = await asyncio.gather(
+        *(cached_generate_image(p) for p in unique),
+        return_exceptions=True
+    )
+    by_prompt = dict(zip(unique, unique_results))
+    results = [by_prompt[p] for _, p in jobs]
+    for (idx, _), image_url in zip(jobs, results):
+        if isinstance(image_url, Exception):
+            logger.warning("     Image error: %s", image_url)
+            image_url = f"{_FALLBACK_IMAGE_BASE}presentation,slide{idx}"
+        elif not image_url:
+            title = slides[idx].get("title", "")
+            image_url = f"{_FALLBACK_IMAGE_BASE}{title.replace(' ', ',')},professional"
+        slides[idx]["imageUrl"] = image_url
+
+
+# Hosts the app will talk to on the first real request; warming them at
+# startup moves the TCP+TLS handshake cost out of user-facing latency
+_WARMUP_URLS = (
+    "https://openrouter.ai/api/v1/models",
+    "https://image.pollinations.ai/",
+    "https://source.unsplash.com/",
+)
+
+
+@app.on_event("startup")
+async def configure_default_executor():
+    """Size the to_thread pool for blocking I/O instead of the tiny default"""
+    executor = ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4),
+        thread_name_prefix="blocking-io"
+    )
+    asyncio.get_event_loop().set_default_executor(executor)
+
+
+@app.on_event("startup")
+async def warm_connections():
+    """Open keep-alive connections to the external providers in the background"""
+    async def _warm():
+        client = _http_client()
+        await asyncio.gather(
+            *(client.head(url) for url in _WARMUP_URLS),
+            return_exceptions=True  # warmup is best-effort
+        )
+    asyncio.ensure_future(_warm())
+
+
+@app.on_event("shutdown")
+async def shutdown_ai_service():
+    """Close the shared HTTP connection pools"""
+    await ai_service.aclose()
+    await document_processor.aclose()
+    if _HTTP_CLIENT is not None and not _HTTP_CLIENT.is_closed:
+        await _HTTP_CLIENT.aclose()
+
 #  UPDATED: AI service for generating presentations
 async def generate_presentation_from_prompt(
     prompt: str,
@@ -145,7 +406,7 @@ async def generate_presentation_from_prompt(
         # Ensure 8-15 range
         num_slides = max(8, min(15, num_slides))
         
-        print(f"🎯 Generating {num_slides} slides...")
+        logger.info("🎯 Generating %s slides...", num_slides)
         
         # ✅ Use AI service with outline sections if provided
         ai_response = await ai_service.generate_presentation(
@@ -161,50 +422,62 @@ async def generate_presentation_from_prompt(
             image_style=image_style
         )
         
-        # Convert to frontend format
-        slides = []
-        for slide_data in ai_response.get("slides", []):
+        # Convert to frontend format. Image generation runs in two passes so
+        # all upstream calls overlap (max latency) instead of serializing one
+        # await per slide (sum of latencies).
+        slide_list = ai_response.get("slides", [])
+        jobs = []  # (slide index, image prompt, title)
+        for idx, slide_data in enumerate(slide_list):
             if "id" not in slide_data or not slide_data["id"]:
-                slide_data["id"] = f"slide_{uuid.uuid4()}"
-    
+                slide_data["id"] = "slide_" + uuid.uuid4().hex
+
             # Check if slide has a chart
             has_chart = slide_data.get("chartData", {}).get("needed", False)
-            image_url = slide_data.get("imageUrl", "")
-    
+
             # Only generate new image if NO chart AND NO existing image
-            if not has_chart and not image_url:
+            if has_chart:
+                # Chart slides don't need images
+                slide_data["imageUrl"] = ""
+            elif not slide_data.get("imageUrl"):
+                title = slide_data.get("title", "")
                 image_prompt = slide_data.get("imagePrompt")
                 if not image_prompt:
-                    title = slide_data.get("title", "")
                     content = slide_data.get("content", "")
                     image_prompt = f"{title}. {content[:100]}. {image_style}, professional, high quality"
-        
-                try:
-                    image_url = await ai_service.generate_image(image_prompt)
-                    if not image_url:
-                        image_url = f"https://image.pollinations.ai/prompt/{urllib.parse.quote(image_prompt)}?width=1920&height=1080&nologo=true&enhance=true&seed={uuid.uuid4()}"
-                except Exception:
+                jobs.append((idx, image_prompt, title))
+
+        if jobs:
+            results = await asyncio.gather(
+                *(cached_generate_image(p) for _, p, _ in jobs),
+                return_exceptions=True
+            )
+            for (idx, image_prompt, title), image_url in zip(jobs, results):
+                if isinstance(image_url, Exception):
                     image_url = f"https://image.pollinations.ai/prompt/{urllib.parse.quote(title)}?width=1920&height=1080&nologo=true&enhance=true&seed={uuid.uuid4()}"
-            elif has_chart:
-                # Chart slides don't need images
-                image_url = ""
-    
-            slide = SlideRequest(
+                elif not image_url:
+                    image_url = f"https://image.pollinations.ai/prompt/{urllib.parse.quote(image_prompt)}?width=1920&height=1080&nologo=true&enhance=true&seed={uuid.uuid4()}"
+                slide_list[idx]["imageUrl"] = image_url
+
+        # All fields are normalized str-for-str right here, so skip the
+        # per-field validation pass entirely
+        slides = [
+            SlideRequest.model_construct(
                 type=slide_data.get("type", "content"),
                 title=slide_data.get("title", ""),  # ✅ This should now be correct from AI
                 content=slide_data.get("content", ""),
                 backgroundColor=slide_data.get("backgroundColor", "#ffffff"),
                 textColor=slide_data.get("textColor", "#1f2937"),
                 layout=slide_data.get("layout", "left"),
-                imageUrl=image_url,
+                imageUrl=slide_data.get("imageUrl", ""),
                 chartUrl=slide_data.get("chartUrl", "")
             )
-            slides.append(slide)
+            for slide_data in slide_list
+        ]
         
         final_count = len(slides)
-        print(f"✅ Created {final_count} slides successfully with unique titles")
+        logger.info("✅ Created %s slides successfully with unique titles", final_count)
         
-        return PresentationResponse(
+        return PresentationResponse.model_construct(
             title=ai_response.get("title", prompt[:50] + "..."),
             description=ai_response.get("description", prompt),
             slides=slides,
@@ -212,92 +485,241 @@ async def generate_presentation_from_prompt(
         )
         
     except Exception as e:
-        print(f"❌ Error in generate_presentation_from_prompt: {e}")
+        logger.exception("Error in generate_presentation_from_prompt")
         # Fallback with correct number of slides
         return create_fallback_presentation(prompt, num_slides or 8)
-def download_image(url: str) -> str:
-    """Download image and return local path"""
+# Shared pooled client for export-time image downloads: keeps TCP/TLS hot
+# across the 8-15 images of a deck instead of a fresh handshake per call.
+# Same lazy-singleton shape as document_processor's client.
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+# URL → image bytes cache for export media: the same deck images get
+# re-downloaded every time a user exports as PDF and again as PPTX, and
+# both renderers consume file-like objects, so the bytes never need to
+# touch disk at all.
+_IMAGE_BYTES_CACHE: Dict[str, bytes] = {}
+_IMAGE_BYTES_CACHE_MAX = 64
+
+# Second-level disk cache behind the in-memory one: survives restarts and
+# is shared by all uvicorn workers, so exporting the same deck twice (or
+# as PDF then PPTX across workers) re-downloads nothing. Files are keyed
+# by a URL hash, expire after a day and the directory is size-bounded
+# with oldest-access-first eviction.
+_DISK_CACHE_DIR = os.path.join(tempfile.gettempdir(), "presai_img")
+os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+_DISK_CACHE_LIMIT = 500_000_000
+_DISK_CACHE_TTL = 86400
+
+
+def _disk_cache_path(url: str) -> str:
+    key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    return os.path.join(_DISK_CACHE_DIR, key)
+
+
+def _disk_cache_read(path: str) -> Optional[bytes]:
+    """Blocking read of a cached image; None on miss/expiry. Run in a thread."""
+    try:
+        if time.time() - os.path.getmtime(path) > _DISK_CACHE_TTL:
+            os.remove(path)
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        os.utime(path)  # refresh mtime so eviction is least-recently-used
+        return data
+    except OSError:
+        return None
+
+
+def _disk_cache_write(path: str, data: bytes) -> None:
+    """Blocking write plus size-bound pruning. Run in a thread."""
+    try:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)  # atomic, safe against concurrent workers
+
+        entries = []
+        total = 0
+        for entry in os.scandir(_DISK_CACHE_DIR):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        if total > _DISK_CACHE_LIMIT:
+            for _, size, stale in sorted(entries):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    continue
+                total -= size
+                if total <= _DISK_CACHE_LIMIT:
+                    break
+    except OSError as e:
+        logger.warning("⚠️ Image disk cache write failed: %s", e)
+
+# One private temp dir per process with monotonic filenames: handing out a
+# name is then just a counter bump, instead of NamedTemporaryFile's
+# open(O_CREAT|O_EXCL)-and-retry plus chmod per file.
+_TMP_DIR = tempfile.mkdtemp(prefix="presai-")
+_TMP_COUNTER = count()
+
+
+def _tmp_path(suffix: str) -> str:
+    return os.path.join(_TMP_DIR, f"{os.getpid()}-{next(_TMP_COUNTER)}{suffix}")
+
+
+def _http_client() -> httpx.AsyncClient:
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        try:
+            _HTTP_CLIENT = httpx.AsyncClient(
+                http2=True, timeout=10, follow_redirects=True, limits=limits
+            )
+        except ImportError:
+            # h2 extra not installed — plain HTTP/1.1 pooling still helps
+            _HTTP_CLIENT = httpx.AsyncClient(
+                timeout=10, follow_redirects=True, limits=limits
+            )
+    return _HTTP_CLIENT
+
+
+# One slow export can queue up dozens of downloads; cap concurrent image
+# fetches so they can't starve every other endpoint's connections
+_DOWNLOAD_SEM = asyncio.Semaphore(16)
+
+
+async def fetch_image_bytes(url: str) -> Optional[bytes]:
+    """Fetch an image into memory, decoding data URLs in place"""
+    # Base64 data URLs are skipped: they'd make megabyte-sized cache keys
+    cacheable = not url.startswith('data:image')
+    if cacheable:
+        cached = _IMAGE_BYTES_CACHE.get(url)
+        if cached:
+            return cached
     try:
         if url.startswith('data:image'):
             # Handle base64 images
             header, encoded = url.split(',', 1)
-            image_data = base64.b64decode(encoded)
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp:
-                tmp.write(image_data)
-                return tmp.name
-        else:
-            # Download from URL
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp:
-                    tmp.write(response.content)
-                    return tmp.name
+            return base64.b64decode(encoded)
+
+        disk_path = _disk_cache_path(url)
+        image_data = await asyncio.to_thread(_disk_cache_read, disk_path)
+        if image_data is None:
+            # Download from URL without blocking the event loop
+            async with _DOWNLOAD_SEM:
+                response = await _http_client().get(url)
+            if response.status_code != 200:
+                return None
+            image_data = response.content
+            await asyncio.to_thread(_disk_cache_write, disk_path, image_data)
+
+        if cacheable:
+            if len(_IMAGE_BYTES_CACHE) >= _IMAGE_BYTES_CACHE_MAX:
+                _IMAGE_BYTES_CACHE.pop(next(iter(_IMAGE_BYTES_CACHE)))
+            _IMAGE_BYTES_CACHE[url] = image_data
+        return image_data
     except Exception as e:
-        print(f"⚠️ Image download error: {e}")
+        logger.warning("⚠️ Image download error: %s", e)
     return None
 
+# All 256 two-digit hex pairs, so a color decodes with three dict hits
+# instead of three int(..., 16) parses (hot in the export loops, which
+# convert the same few theme colors for every slide)
+_HEX2INT = {f"{i:02x}": i for i in range(256)}
+
+
+@lru_cache(maxsize=256)
 def hex_to_rgb(hex_color: str):
     """Convert hex color to RGB tuple"""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    h = hex_color.lstrip('#').lower()
+    return (_HEX2INT[h[0:2]], _HEX2INT[h[2:4]], _HEX2INT[h[4:6]])
+# Single home for the stock-photo fallback base: the same literal was
+# repeated at every fallback site, which bloats the bytecode and makes
+# swapping in a CDN-cached placeholder a multi-file hunt.
+_FALLBACK_IMAGE_BASE = "https://source.unsplash.com/1200x800/?"
+
+# Static parts of the fallback slides, built once instead of re-created as
+# keyword literals on every fallback (which runs whenever AI generation fails)
+# The 15 possible fallback slide URLs, built once at import instead of
+# per-call f-string work in create_fallback_presentation
+_FALLBACK_SLIDE_URLS = tuple(
+    f"{_FALLBACK_IMAGE_BASE}business,presentation,slide{i}" for i in range(16)
+)
+
+_FALLBACK_TITLE_STATIC = {
+    "type": "title",
+    "backgroundColor": "#3b82f6",
+    "textColor": "#ffffff",
+    "layout": "center",
+    "imageUrl": _FALLBACK_IMAGE_BASE + "presentation,title"
+}
+_FALLBACK_CONTENT_STATIC = {
+    "type": "content",
+    "backgroundColor": "#ffffff",
+    "textColor": "#1f2937",
+    "layout": "left"
+}
+_FALLBACK_CONCLUSION_STATIC = {
+    "type": "content",
+    "title": "Conclusion",
+    "backgroundColor": "#1f2937",
+    "textColor": "#ffffff",
+    "layout": "center",
+    "imageUrl": _FALLBACK_IMAGE_BASE + "conclusion,thankyou"
+}
+
+
 #  UPDATED: Fallback with exact slide count
 def create_fallback_presentation(prompt: str, num_slides: int = 8) -> PresentationResponse:
     """Create fallback presentation with exact slide count (8-15)"""
     num_slides = max(8, min(15, num_slides))
     title = extract_title_from_prompt(prompt)
+
+    content_body = f"Important information about {prompt}\n\n• Detail 1\n• Detail 2\n• Detail 3"
+
+    slides = [
+        # Title slide
+        SlideRequest.model_construct(
+            **_FALLBACK_TITLE_STATIC,
+            title=title,
+            content=f"A comprehensive presentation about {prompt}"
+        ),
+        # Content slides
+        *(
+            SlideRequest.model_construct(
+                **_FALLBACK_CONTENT_STATIC,
+                title=f"Key Point {i}: {title}",
+                content=content_body,
+                imageUrl=_FALLBACK_SLIDE_URLS[i]
+            )
+            for i in range(1, num_slides - 1)
+        ),
+        # Conclusion slide
+        SlideRequest.model_construct(
+            **_FALLBACK_CONCLUSION_STATIC,
+            content=f"Thank you!\n\nKey takeaways about {prompt}"
+        ),
+    ]
     
-    slides = []
-    
-    # Title slide
-    slides.append(SlideRequest(
-        type="title",
-        title=title,
-        content=f"A comprehensive presentation about {prompt}",
-        backgroundColor="#3b82f6",
-        textColor="#ffffff",
-        layout="center",
-        imageUrl="https://source.unsplash.com/1200x800/?presentation,title"
-    ))
-    
-    # Content slides
-    for i in range(1, num_slides - 1):
-        slides.append(SlideRequest(
-            type="content",
-            title=f"Key Point {i}: {title}",
-            content=f"Important information about {prompt}\n\n• Detail 1\n• Detail 2\n• Detail 3",
-            backgroundColor="#ffffff",
-            textColor="#1f2937",
-            layout="left",
-            imageUrl=f"https://source.unsplash.com/1200x800/?business,presentation,slide{i}"
-        ))
-    
-    # Conclusion slide
-    slides.append(SlideRequest(
-        type="content",
-        title="Conclusion",
-        content=f"Thank you!\n\nKey takeaways about {prompt}",
-        backgroundColor="#1f2937",
-        textColor="#ffffff",
-        layout="center",
-        imageUrl="https://source.unsplash.com/1200x800/?conclusion,thankyou"
-    ))
-    
-    print(f" Created fallback presentation with {len(slides)} slides")
+    logger.info(" Created fallback presentation with %s slides", len(slides))
     
-    return PresentationResponse(
+    return PresentationResponse.model_construct(
         title=title,
         description=prompt,
         slides=slides,
         theme="modern"
     )
 
+# Strips everything but letters, digits and whitespace in one C-level pass
+_TITLE_RE = re.compile(r'[^A-Za-z0-9\s]+')
+
+
+# Pure string→string function, so repeated prompts (fallback retries,
+# regenerations) skip the cleanup entirely
+@lru_cache(maxsize=1024)
 def extract_title_from_prompt(prompt: str) -> str:
     """Extract a clean title from the prompt"""
-    words = prompt.split()
-    title = " ".join(word.capitalize() for word in words)
-    title = "".join(c for c in title if c.isalnum() or c.isspace()).strip()
-    return title[:50]
+    return _TITLE_RE.sub('', prompt).strip().title()[:50]
 
 # ============================================================================
 # API ROUTES
@@ -316,7 +738,10 @@ async def health_check():
     }
 
 #  UPDATED: Generate complete presentation
-@app.post("/api/generate-presentation", response_model=PresentationResponse)
+# No response_model here on purpose: the PresentationResponse coming back
+# from generate_presentation_from_prompt is already validated, and the
+# decorator would re-run every slide validator before serializing.
+@app.post("/api/generate-presentation")
 async def generate_presentation(request: GeneratePresentationRequest):
     """
     Generate complete presentation (8-15 slides) from prompt.
@@ -326,11 +751,11 @@ async def generate_presentation(request: GeneratePresentationRequest):
         if not request.prompt.strip() and not request.outline_sections:
             raise HTTPException(status_code=400, detail="Prompt or outline is required")
         
-        print(f"🎨 Generating full presentation...")
+        logger.info("🎨 Generating full presentation...")
         
         # ✅ Check if outline sections were provided
         if request.outline_sections and len(request.outline_sections) > 0:
-            print(f"📋 Using {len(request.outline_sections)} outline sections")
+            logger.info("📋 Using %s outline sections", len(request.outline_sections))
             
             # Generate from outline sections
             presentation = await generate_presentation_from_prompt(
@@ -347,7 +772,7 @@ async def generate_presentation(request: GeneratePresentationRequest):
             )
         else:
             # Generate from prompt only
-            print(f"💭 Generating from prompt only")
+            logger.info("💭 Generating from prompt only")
             presentation = await generate_presentation_from_prompt(
                 request.prompt,
                 request.model,
@@ -360,16 +785,98 @@ async def generate_presentation(request: GeneratePresentationRequest):
         
         # Validate slide count
         if slide_count < 8 or slide_count > 15:
-            print(f"⚠️ Warning: Generated {slide_count} slides (expected 8-15)")
-        
-        print(f"✅ Generated presentation with {slide_count} slides")
+            logger.warning("⚠️ Warning: Generated %s slides (expected 8-15)", slide_count)
         
-        return presentation
+        logger.info("✅ Generated presentation with %s slides", slide_count)
+
+        # Serialize straight from the validated model — one dump, no
+        # jsonable_encoder walk
+        return _DefaultResponse(content=presentation.model_dump(mode="json"))
         
     except Exception as e:
-        print(f"❌ Error in generate_presentation: {e}")
+        logger.exception("Error in generate_presentation")
         raise HTTPException(status_code=500, detail=f"Failed to generate presentation: {str(e)}")
 
+#  NEW: Streaming variant — slides arrive as soon as their image resolves
+@app.post("/api/generate-presentation/stream")
+async def generate_presentation_stream(request: GeneratePresentationRequest):
+    """
+    Stream a presentation as NDJSON: one metadata line, then one line per
+    slide (with its index) as soon as its image URL resolves. Client TTFB is
+    bounded by the text generation, not the slowest image. The aggregated
+    /api/generate-presentation endpoint is unchanged for back-compat.
+    """
+    if not request.prompt.strip() and not request.outline_sections:
+        raise HTTPException(status_code=400, detail="Prompt or outline is required")
+
+    num_slides = request.num_slides
+    if request.outline_sections:
+        num_slides = len(request.outline_sections)
+    num_slides = max(8, min(15, num_slides or 10))
+
+    async def gen():
+        ai_response = await ai_service.generate_presentation(
+            request.prompt,
+            request.model,
+            request.theme,
+            request.include_interactive,
+            num_slides=num_slides,
+            audience=request.audience,
+            purpose=request.purpose,
+            outline_sections=request.outline_sections,
+            text_level=request.text_level,
+            image_style=request.image_style
+        )
+        slide_list = ai_response.get("slides", [])
+
+        yield _ndjson_line({
+            "title": ai_response.get("title", request.prompt[:50] + "..."),
+            "description": ai_response.get("description", request.prompt),
+            "theme": ai_response.get("theme", "modern"),
+            "slide_count": len(slide_list)
+        })
+
+        async def finish_slide(idx, slide_data):
+            if "id" not in slide_data or not slide_data["id"]:
+                slide_data["id"] = "slide_" + uuid.uuid4().hex
+            has_chart = slide_data.get("chartData", {}).get("needed", False)
+            if has_chart:
+                slide_data["imageUrl"] = ""
+            elif not slide_data.get("imageUrl"):
+                title = slide_data.get("title", "")
+                image_prompt = slide_data.get("imagePrompt") or (
+                    f"{title}. {slide_data.get('content', '')[:100]}. "
+                    f"{request.image_style}, professional, high quality"
+                )
+                try:
+                    image_url = await cached_generate_image(image_prompt)
+                except Exception:
+                    image_url = None
+                if not image_url:
+                    image_url = f"https://image.pollinations.ai/prompt/{urllib.parse.quote(image_prompt)}?width=1920&height=1080&nologo=true&enhance=true&seed={uuid.uuid4()}"
+                slide_data["imageUrl"] = image_url
+            return idx, slide_data
+
+        tasks = [
+            asyncio.ensure_future(finish_slide(idx, slide_data))
+            for idx, slide_data in enumerate(slide_list)
+        ]
+        for task in asyncio.as_completed(tasks):
+            idx, slide_data = await task
+            yield _ndjson_line({
+                "index": idx,
+                "type": slide_data.get("type", "content"),
+                "title": slide_data.get("title", ""),
+                "content": slide_data.get("content", ""),
+                "backgroundColor": slide_data.get("backgroundColor", "#ffffff"),
+                "textColor": slide_data.get("textColor", "#1f2937"),
+                "layout": slide_data.get("layout", "left"),
+                "imageUrl": slide_data.get("imageUrl", ""),
+                "chartUrl": slide_data.get("chartUrl", "")
+            })
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
+
 @app.post("/api/save-presentation")
 async def save_presentation(presentation: PresentationRequest):
     """Save a presentation (placeholder for future database integration)"""
@@ -390,22 +897,53 @@ async def get_presentations():
         "message": "No presentations found (database not implemented yet)"
     }
 
+# /api/models and /api/themes are polled by the frontend but their data
+# changes rarely, so both serve pre-encoded bytes for 5 minutes. The lock
+# makes refreshes single-flight: one upstream call per expiry, not one
+# per concurrent poller.
+_MODELS_TTL = 300.0
+_models_cache: tuple | None = None  # (expires_at, encoded bytes)
+_models_lock = asyncio.Lock()
+_themes_cache: tuple | None = None
+_themes_lock = asyncio.Lock()
+
+
 @app.get("/api/models")
 async def get_available_models():
     """Get available AI models from OpenRouter"""
-    try:
-        models = await ai_service.get_available_models()
-        return {
-            "models": models,
-            "default_model": ai_service.default_model
-        }
-    except Exception as e:
-        print(f"Error fetching models: {e}")
-        return {
-            "models": [],
-            "default_model": ai_service.default_model,
-            "error": "Failed to fetch models"
-        }
+    global _models_cache
+    now = asyncio.get_event_loop().time()
+    if _models_cache and _models_cache[0] > now:
+        return Response(content=_models_cache[1], media_type="application/json")
+
+    async with _models_lock:
+        if _models_cache and _models_cache[0] > asyncio.get_event_loop().time():
+            return Response(content=_models_cache[1], media_type="application/json")
+        try:
+            models = await ai_service.get_available_models()
+            payload = {
+                "models": models,
+                "default_model": ai_service.default_model
+            }
+        except Exception:
+            logger.exception("Error fetching models")
+            return {
+                "models": [],
+                "default_model": ai_service.default_model,
+                "error": "Failed to fetch models"
+            }
+        encoded = _ndjson_line(payload)[:-1]  # same encoder, minus the newline
+        _models_cache = (asyncio.get_event_loop().time() + _MODELS_TTL, encoded)
+        return Response(content=encoded, media_type="application/json")
+
+
+@app.post("/api/models/refresh")
+async def refresh_models_cache():
+    """Drop the models/themes caches so the next fetch goes upstream"""
+    global _models_cache, _themes_cache
+    _models_cache = None
+    _themes_cache = None
+    return {"message": "Model and theme caches cleared"}
 
 @app.post("/api/generate-image")
 async def generate_image(request: dict):
@@ -415,7 +953,7 @@ async def generate_image(request: dict):
         if not image_prompt:
             raise HTTPException(status_code=400, detail="Image prompt is required")
         
-        image_url = await ai_service.generate_image(image_prompt)
+        image_url = await cached_generate_image(image_prompt)
         if not image_url:
             raise HTTPException(status_code=500, detail="Failed to generate image")
         
@@ -424,27 +962,58 @@ async def generate_image(request: dict):
             "prompt": image_prompt
         }
     except Exception as e:
-        print(f"Error generating image: {e}")
+        logger.exception("Error generating image")
         raise HTTPException(status_code=500, detail=f"Failed to generate image: {str(e)}")
 
+@app.post("/api/image-cache/clear")
+async def clear_image_cache():
+    """Drop all cached prompt-to-image mappings"""
+    cleared = len(_IMAGE_CACHE)
+    _IMAGE_CACHE.clear()
+    return {"cleared": cleared, "message": "Image cache cleared"}
+
+# Upload cap for /api/upload-document (streamed in 1MB chunks)
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+
+
 @app.post("/api/upload-document")
 async def upload_document(file: UploadFile = File(...)):
     """Upload and process a document (PDF, DOCX, PPT, TXT, CSV, XLSX, etc.)"""
+    # Validate file type before entering the fallible-I/O section
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    if file_ext not in _SUPPORTED_EXTS:
+        raise HTTPException(status_code=400, detail=_SUPPORTED_EXTS_DETAIL)
+
+    # Starlette knows the size up front for multipart uploads with a
+    # Content-Length — reject oversized files before reading a byte
+    if file.size and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large (max {MAX_UPLOAD_BYTES // (1 << 20)} MB)"
+        )
+
     try:
-        # Validate file type
-        file_ext = os.path.splitext(file.filename)[1].lower()
-        if file_ext not in document_processor.supported_formats:
+        # Save uploaded file temporarily, streaming in 1MB chunks so large
+        # uploads never sit fully in RAM and disk writes don't block the loop
+        bytes_written = 0
+        tmp_file_path = _tmp_path(file_ext)
+        over_limit = False
+        with open(tmp_file_path, 'wb') as tmp_file:
+            while chunk := await file.read(1 << 20):
+                bytes_written += len(chunk)
+                if bytes_written > MAX_UPLOAD_BYTES:
+                    over_limit = True
+                    break
+                await asyncio.to_thread(tmp_file.write, chunk)
+        if over_limit:
+            # Unlink only after the with block closes the handle — deleting
+            # an open file raises PermissionError on Windows
+            os.unlink(tmp_file_path)
             raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file format. Supported: {', '.join(document_processor.supported_formats)}"
+                status_code=413,
+                detail=f"File too large (max {MAX_UPLOAD_BYTES // (1 << 20)} MB)"
             )
-        
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
+
         try:
             # Process the document
             result = await document_processor.process_document(tmp_file_path, file.filename)
@@ -463,9 +1032,11 @@ async def upload_document(file: UploadFile = File(...)):
             # Clean up temporary file
             if os.path.exists(tmp_file_path):
                 os.unlink(tmp_file_path)
-                
+
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error processing document: {e}")
+        logger.exception("Error processing document")
         raise HTTPException(status_code=500, detail=f"Failed to process document: {str(e)}")
 
 @app.post("/api/ingest-url")
@@ -479,7 +1050,7 @@ async def ingest_url(req: UrlIngestRequest):
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to fetch URL"))
         return result
     except Exception as e:
-        print(f"Error ingesting URL: {e}")
+        logger.exception("Error ingesting URL")
         raise HTTPException(status_code=500, detail=f"Failed to ingest URL: {str(e)}")
 
 @app.post("/api/ingest-text")
@@ -493,18 +1064,44 @@ async def ingest_text(req: TextIngestRequest):
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to ingest text"))
         return result
     except Exception as e:
-        print(f"Error ingesting text: {e}")
+        logger.exception("Error ingesting text")
         raise HTTPException(status_code=500, detail=f"Failed to ingest text: {str(e)}")
 
+# Content-hash response cache for the outline/slide LLM endpoints: repeated
+# identical inputs (retries, regenerates, demo prompts) return instantly
+# instead of paying for another model call. Same bounded-dict pattern as
+# _IMAGE_CACHE, plus a TTL so stale generations age out.
+_RESPONSE_CACHE: Dict[str, tuple] = {}  # key -> (expires_at, payload)
+_RESPONSE_CACHE_MAX = 256
+_RESPONSE_CACHE_TTL = 86400.0
+
+
+def _response_cache_get(key: str):
+    hit = _RESPONSE_CACHE.get(key)
+    if hit and hit[0] > asyncio.get_event_loop().time():
+        return hit[1]
+    return None
+
+
+def _response_cache_put(key: str, payload) -> None:
+    if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX:
+        _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)))
+    _RESPONSE_CACHE[key] = (asyncio.get_event_loop().time() + _RESPONSE_CACHE_TTL, payload)
+
+
 #  UPDATED: Generate outline (8-15 sections)
 @app.post("/api/generate-outline")
-async def generate_outline(req: OutlineRequest):
+async def generate_outline(req: OutlineRequest, force_refresh: bool = False):
     """Generate 8-15 section outline from text input"""
-    try:
-        print(f"🧠 Generating outline from prompt: {req.content[:100]}...")
+    if not req.content:
+        raise HTTPException(status_code=400, detail="Content is required")
+
+    cache_key = "outline:" + hashlib.blake2b(req.content.encode(), digest_size=16).hexdigest()
+    if not force_refresh and (cached := _response_cache_get(cache_key)):
+        return cached
 
-        if not req.content:
-            raise HTTPException(status_code=400, detail="Content is required")
+    try:
+        logger.info("🧠 Generating outline from prompt: %s...", req.content[:100])
 
         outline = await ai_service.generate_outline(req.content)
 
@@ -515,53 +1112,51 @@ async def generate_outline(req: OutlineRequest):
         
         #  Validate count
         if section_count < 8 or section_count > 15:
-            print(f" Warning: Got {section_count} sections (expected 8-15)")
+            logger.warning(" Warning: Got %s sections (expected 8-15)", section_count)
         
-        print(f" Generated outline with {section_count} sections")
+        logger.info(" Generated outline with %s sections", section_count)
 
+        _response_cache_put(cache_key, outline)
         return outline
         
     except Exception as e:
-        print(f" Error generating outline: {e}")
+        logger.exception("Error generating outline")
         raise HTTPException(status_code=500, detail=f"Failed to generate outline: {str(e)}")
 
 #  KEPT: Generate slides from outline
 @app.post("/api/generate-slides")
-async def generate_slides(req: OutlineToSlidesRequest):
+async def generate_slides(req: OutlineToSlidesRequest, force_refresh: bool = False):
     """Convert outline sections to full slides with images"""
+    if not req.outline:
+        raise HTTPException(status_code=400, detail="Outline is required")
+
+    outline_bytes = (
+        orjson.dumps(req.outline, option=orjson.OPT_SORT_KEYS)
+        if orjson is not None
+        else json.dumps(req.outline, sort_keys=True).encode()
+    )
+    cache_key = "slides:" + hashlib.blake2b(outline_bytes, digest_size=16).hexdigest()
+    if not force_refresh and (cached := _response_cache_get(cache_key)):
+        return cached
+
     try:
-        if not req.outline:
-            raise HTTPException(status_code=400, detail="Outline is required")
-        
-        print(f"🎨 Converting outline to slides...")
+        logger.info("🎨 Converting outline to slides...")
         
         slides_payload = await ai_service.generate_slides_from_outline(req.outline)
 
-        # Ensure images for each slide
-        enriched_slides = []
-        for idx, slide in enumerate(slides_payload.get("slides", [])):
-            image_url = slide.get("imageUrl")
-            
-            if not image_url:
-                prompt = slide.get("imagePrompt") or f"Professional presentation slide: {slide.get('title','')}. {slide.get('content','')[:100]}"
-                try:
-                    gen = await ai_service.generate_image(prompt)
-                    image_url = gen or f"https://source.unsplash.com/1200x800/?presentation,slide{idx}"
-                except Exception:
-                    image_url = f"https://source.unsplash.com/1200x800/?presentation,slide{idx}"
-            
-            slide["imageUrl"] = image_url
-            enriched_slides.append(slide)
-
+        # Ensure images for each slide — dispatch all generations at once
+        enriched_slides = slides_payload.get("slides", [])
+        await _ensure_slide_images(enriched_slides)
         slides_payload["slides"] = enriched_slides
-        
+
         slide_count = len(enriched_slides)
-        print(f" Generated {slide_count} complete slides with images")
-        
+        logger.info(" Generated %s complete slides with images", slide_count)
+
+        _response_cache_put(cache_key, slides_payload)
         return slides_payload
         
     except Exception as e:
-        print(f" Error generating slides from outline: {e}")
+        logger.exception("Error generating slides from outline")
         raise HTTPException(status_code=500, detail=f"Failed to generate slides: {str(e)}")
 
 #  UPDATED: Summarize document (Critical endpoint)
@@ -581,8 +1176,8 @@ async def summarize_document(request: dict):
         if not document_content:
             raise HTTPException(status_code=400, detail="Document content is required")
 
-        print(f"📄 Processing document: {filename}")
-        print(f"   Mode: {'Outline only (8-15 sections)' if outline_only else 'Full slides with images (8-15)'}")
+        logger.info("📄 Processing document: %s", filename)
+        logger.info("   Mode: %s", 'Outline only (8-15 sections)' if outline_only else 'Full slides with images (8-15)')
 
         # Get AI response
         ai_response = await ai_service.summarize_document(
@@ -600,11 +1195,11 @@ async def summarize_document(request: dict):
             
             #  Validate count
             if section_count < 8:
-                print(f" Warning: Only {section_count} sections, expected min 8")
+                logger.warning(" Warning: Only %s sections, expected min 8", section_count)
             elif section_count > 15:
-                print(f" Warning: Got {section_count} sections, expected max 15")
+                logger.warning(" Warning: Got %s sections, expected max 15", section_count)
 
-            print(f" Returning {section_count} outline sections")
+            logger.info(" Returning %s outline sections", section_count)
 
             return {
                 "title": ai_response.get("title", f"Outline: {filename}"),
@@ -626,52 +1221,32 @@ async def summarize_document(request: dict):
             
             #  Validate count
             if slide_count < 8:
-                print(f" Warning: Only {slide_count} slides, expected min 8")
+                logger.warning(" Warning: Only %s slides, expected min 8", slide_count)
             elif slide_count > 15:
-                print(f" Warning: Got {slide_count} slides, expected max 15")
-
-            print(f"🎨 Generating images for {slide_count} slides...")
-
-            # Add images to each slide
-            enriched_slides = []
-            for idx, slide_data in enumerate(slides):
-                print(f"  📍 [{idx+1}/{slide_count}] Processing: {slide_data.get('title', 'Untitled')[:50]}")
-                
-                # Get or generate image
-                image_url = slide_data.get("imageUrl")
-                
-                if not image_url:
-                    title = slide_data.get("title", "")
-                    content = slide_data.get("content", "")[:200]
-                    
-                    image_prompt = f"Professional presentation slide for: {title}. Modern, clean, high quality, 4k"
-                    
-                    try:
-                        image_url = await ai_service.generate_image(image_prompt)
-                        if not image_url:
-                            image_url = f"https://source.unsplash.com/1200x800/?{title.replace(' ', ',')},professional"
-                        print(f"     Image generated")
-                    except Exception as img_error:
-                        print(f"     Image error: {img_error}")
-                        image_url = f"https://source.unsplash.com/1200x800/?presentation,slide{idx}"
-                
-                # Build clean slide object
-                enriched_slide = {
-                    "id": slide_data.get("id", f"slide_{idx}_{int(datetime.now().timestamp())}"),
+                logger.warning(" Warning: Got %s slides, expected max 15", slide_count)
+
+            logger.info("🎨 Generating images for %s slides...", slide_count)
+
+            await _ensure_slide_images(slides)
+
+            base_ts = int(datetime.now().timestamp())
+            enriched_slides = [
+                {
+                    "id": slide_data.get("id", f"slide_{idx}_{base_ts}"),
                     "type": slide_data.get("type", "content"),
                     "title": slide_data.get("title", f"Slide {idx+1}"),
                     "content": slide_data.get("content", ""),
-                    "imageUrl": image_url,
+                    "imageUrl": slide_data.get("imageUrl", ""),
                     "chartUrl": slide_data.get("chartUrl", ""),
                     "layout": slide_data.get("layout", "split"),
                     "textAlign": slide_data.get("textAlign", "left"),
                     "backgroundColor": slide_data.get("backgroundColor", "#ffffff"),
                     "textColor": slide_data.get("textColor", "#1f2937")
                 }
-                
-                enriched_slides.append(enriched_slide)
+                for idx, slide_data in enumerate(slides)
+            ]
 
-            print(f" Generated {len(enriched_slides)} complete slides with images")
+            logger.info(" Generated %s complete slides with images", len(enriched_slides))
 
             return {
                 "title": ai_response.get("title", f"Summary: {filename}"),
@@ -683,9 +1258,7 @@ async def summarize_document(request: dict):
     except HTTPException:
         raise
     except Exception as e:
-        print(f" Error in summarize_document: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in summarize_document")
         raise HTTPException(status_code=500, detail=f"Failed to process document: {str(e)}")
 
 # ============================================================================
@@ -764,22 +1337,34 @@ async def change_tone(data: SlideRequest):
 @app.get("/api/themes")
 async def get_themes():
     """Get available themes"""
-    try:
-        themes = ai_service.get_available_themes()
-        return {
-            "themes": themes,
-            "message": "Available themes retrieved successfully"
-        }
-    except Exception as e:
-        print(f"Error fetching themes: {e}")
-        return {
-            "themes": [],
-            "error": "Failed to fetch themes"
-        }
+    global _themes_cache
+    now = asyncio.get_event_loop().time()
+    if _themes_cache and _themes_cache[0] > now:
+        return Response(content=_themes_cache[1], media_type="application/json")
+
+    async with _themes_lock:
+        if _themes_cache and _themes_cache[0] > asyncio.get_event_loop().time():
+            return Response(content=_themes_cache[1], media_type="application/json")
+        try:
+            themes = ai_service.get_available_themes()
+            payload = {
+                "themes": themes,
+                "message": "Available themes retrieved successfully"
+            }
+        except Exception:
+            logger.exception("Error fetching themes")
+            return {
+                "themes": [],
+                "error": "Failed to fetch themes"
+            }
+        encoded = _ndjson_line(payload)[:-1]
+        _themes_cache = (asyncio.get_event_loop().time() + _MODELS_TTL, encoded)
+        return Response(content=encoded, media_type="application/json")
 
 @app.post("/api/create-theme")
 async def create_theme(request: CreateThemeRequest):
     """Create a custom theme"""
+    global _themes_cache
     try:
         if not request.name.strip():
             raise HTTPException(status_code=400, detail="Theme name is required")
@@ -795,13 +1380,16 @@ async def create_theme(request: CreateThemeRequest):
             image_style_keywords=request.image_style_keywords
         )
         
+        # The cached /api/themes payload no longer reflects reality
+        _themes_cache = None
+
         return {
             "theme_name": theme_name,
             "message": "Custom theme created successfully"
         }
         
     except Exception as e:
-        print(f"Error creating theme: {e}")
+        logger.exception("Error creating theme")
         raise HTTPException(status_code=500, detail=f"Failed to create theme: {str(e)}")
 
 # ============================================================================
@@ -815,17 +1403,20 @@ async def generate_slide(request: GenerateSlideRequest):
         if not request.prompt.strip():
             raise HTTPException(status_code=400, detail="Prompt is required")
         
-        slide = await ai_service.generate_slide_from_prompt(
-            request.prompt, 
-            request.model, 
-            request.theme
+        slide = await slide_batcher.submit(
+            (request.prompt, request.model, request.theme)
         )
         return slide
         
     except Exception as e:
-        print(f"Error in generate_slide endpoint: {e}")
+        logger.exception("Error in generate_slide endpoint")
         raise HTTPException(status_code=500, detail=f"Failed to generate slide: {str(e)}")
 
+# Keeps word characters, spaces and dashes — same set the old per-char
+# generator kept, in one C-level pass like _TITLE_RE above
+_SAFE_TITLE_RE = re.compile(r'[^\w \-]+')
+
+
 @app.post("/api/export-presentation")
 async def export_presentation_endpoint(request: dict):
     """Export presentation in multiple formats (JSON, PDF, PPTX)"""
@@ -835,9 +1426,8 @@ async def export_presentation_endpoint(request: dict):
         theme = request.get("theme", "modern")
         export_format = request.get("format", "json").lower()
         
-        # Sanitize filename
-        safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_title = safe_title.replace(' ', '-')[:50] or "presentation"
+        # Sanitize filename in one C-level translate pass
+        safe_title = _SAFE_TITLE_RE.sub('', title).strip().replace(' ', '-')[:50] or "presentation"
         
         if export_format == "pdf":
             return await export_as_pdf(title, slides, safe_title)
@@ -847,291 +1437,302 @@ async def export_presentation_endpoint(request: dict):
             raise HTTPException(status_code=400, detail=f"Unsupported format: {export_format}")
             
     except Exception as e:
-        print(f"❌ Export error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Export error")
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
+async def _download_export_media(slides: list, jobs: list) -> list:
+    """Fetch every image/chart an export will embed, concurrently.
+
+    jobs is a list of (slide index, "image"|"chart", url); the return value
+    is one {"image": bytes, "chart": bytes} dict per slide. Everything
+    stays in memory — both renderers take file-like objects.
+    """
+    media = [{"image": None, "chart": None} for _ in slides]
+    if jobs:
+        # A chart or logo URL repeated across slides is fetched once and
+        # the bytes shared; python-pptx likewise content-hashes images so
+        # shared bytes become a single embedded part in the output
+        unique = list(dict.fromkeys(url for _, _, url in jobs))
+        blobs = await asyncio.gather(*(fetch_image_bytes(url) for url in unique))
+        by_url = dict(zip(unique, blobs))
+        for idx, kind, url in jobs:
+            media[idx][kind] = by_url[url]
+    return media
+
+
+def _build_pdf(title: str, slides: list, media: list) -> io.BytesIO:
+    """Render the deck with reportlab. Blocking — run off the event loop."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+
+    for idx, slide in enumerate(slides):
+        if idx > 0:
+            c.showPage()
+
+        # Background color
+        bg_color = slide.get('backgroundColor', '#ffffff')
+        if bg_color and bg_color != '#ffffff':
+            try:
+                r, g, b = hex_to_rgb(bg_color)
+                c.setFillColorRGB(r/255, g/255, b/255)
+                c.rect(0, 0, width, height, fill=1, stroke=0)
+            except:
+                pass
+
+        # Title
+        c.setFont("Helvetica-Bold", 28)
+        text_color = slide.get('textColor', '#1f2937')
+        try:
+            r, g, b = hex_to_rgb(text_color)
+            c.setFillColorRGB(r/255, g/255, b/255)
+        except:
+            c.setFillColorRGB(0.12, 0.16, 0.22)
+
+        title_text = slide.get('title', f'Slide {idx + 1}')
+        c.drawString(50, height - 80, title_text[:60])
+
+        # Content: one text object per slide batches the font/metric setup
+        # that per-line drawString calls would repeat for every line.
+        y_position = height - 130
+        content = slide.get('content', '')
+        content_lines = content.split('\n')
+
+        text = c.beginText(70, y_position)
+        text.setFont("Helvetica", 14)
+        text.setLeading(22)
+        for line in content_lines[:20]:
+            if y_position < 150:
+                break
+            text.textLine(line.replace('•', '-').strip()[:90])
+            y_position -= 22
+        c.drawText(text)
+
+        # Image (pre-downloaded; only set when layout allows and no chart)
+        layout = slide.get('layout', 'split')
+        img_bytes = media[idx]["image"]
+        if img_bytes:
+            try:
+                img = ImageReader(io.BytesIO(img_bytes))
+                img_width = 250
+                img_height = 180
+
+                if layout == 'split':
+                    c.drawImage(img, width - img_width - 50, height - 280,
+                              width=img_width, height=img_height,
+                              preserveAspectRatio=True, mask='auto')
+                else:
+                    c.drawImage(img, (width - img_width) / 2, 200,
+                              width=img_width, height=img_height,
+                              preserveAspectRatio=True, mask='auto')
+            except Exception as e:
+                logger.warning("⚠️ PDF image error: %s", e)
+
+        # Chart (takes priority over image)
+        chart_bytes = media[idx]["chart"]
+        if chart_bytes:
+            try:
+                chart_img = ImageReader(io.BytesIO(chart_bytes))
+                chart_width = 500
+                chart_height = 300
+
+                c.drawImage(chart_img, (width - chart_width) / 2, 100,
+                          width=chart_width, height=chart_height,
+                          preserveAspectRatio=True, mask='auto')
+            except Exception as e:
+                logger.warning("⚠️ PDF chart error: %s", e)
+
+        # Footer
+        c.setFont("Helvetica", 9)
+        c.setFillColorRGB(0.6, 0.6, 0.6)
+        c.drawString(50, 30, f"{title} - Slide {idx + 1}/{len(slides)}")
+        c.drawRightString(width - 50, 30, datetime.now().strftime("%B %d, %Y"))
+
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+
 async def export_as_pdf(title: str, slides: list, filename: str):
     """Export as PDF file"""
     try:
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            pdf_path = tmp_file.name
-        
-        # Create PDF
-        c = canvas.Canvas(pdf_path, pagesize=letter)
-        width, height = letter
-        
+        # Fetch all embedded media concurrently, then hand the CPU-bound
+        # reportlab rendering to a worker thread so the event loop keeps
+        # serving other requests during the build
+        jobs = []
         for idx, slide in enumerate(slides):
-            if idx > 0:
-                c.showPage()
-            
-            # Background color
-            bg_color = slide.get('backgroundColor', '#ffffff')
-            if bg_color and bg_color != '#ffffff':
-                try:
-                    r, g, b = hex_to_rgb(bg_color)
-                    c.setFillColorRGB(r/255, g/255, b/255)
-                    c.rect(0, 0, width, height, fill=1, stroke=0)
-                except:
-                    pass
-            
-            # Title
-            c.setFont("Helvetica-Bold", 28)
-            text_color = slide.get('textColor', '#1f2937')
-            try:
-                r, g, b = hex_to_rgb(text_color)
-                c.setFillColorRGB(r/255, g/255, b/255)
-            except:
-                c.setFillColorRGB(0.12, 0.16, 0.22)
-            
-            title_text = slide.get('title', f'Slide {idx + 1}')
-            c.drawString(50, height - 80, title_text[:60])
-            
-            # Content
-            c.setFont("Helvetica", 14)
-            y_position = height - 130
-            content = slide.get('content', '')
-            content_lines = content.split('\n')
-            
-            for line in content_lines[:20]:
-                if y_position < 150:
-                    break
-                clean_line = line.replace('•', '-').strip()[:90]
-                if clean_line:
-                    c.drawString(70, y_position, clean_line)
-                y_position -= 22
-            
-            # Image (if layout includes image and not just chart)
-            layout = slide.get('layout', 'split')
-            image_url = slide.get('imageUrl')
-            chart_url = slide.get('chartUrl')
-            
-            if image_url and layout != 'full-text' and not chart_url:
-                img_path = download_image(image_url)
-                if img_path:
-                    try:
-                        img = ImageReader(img_path)
-                        img_width = 250
-                        img_height = 180
-                        
-                        if layout == 'split':
-                            c.drawImage(img, width - img_width - 50, height - 280, 
-                                      width=img_width, height=img_height, 
-                                      preserveAspectRatio=True, mask='auto')
-                        else:
-                            c.drawImage(img, (width - img_width) / 2, 200, 
-                                      width=img_width, height=img_height, 
-                                      preserveAspectRatio=True, mask='auto')
-                        
-                        os.unlink(img_path)
-                    except Exception as e:
-                        print(f"⚠️ PDF image error: {e}")
-            
-            # Chart (takes priority over image)
-            if chart_url:
-                chart_path = download_image(chart_url)
-                if chart_path:
-                    try:
-                        chart_img = ImageReader(chart_path)
-                        chart_width = 500
-                        chart_height = 300
-                        
-                        c.drawImage(chart_img, (width - chart_width) / 2, 100,
-                                  width=chart_width, height=chart_height,
-                                  preserveAspectRatio=True, mask='auto')
-                        
-                        os.unlink(chart_path)
-                    except Exception as e:
-                        print(f"⚠️ PDF chart error: {e}")
-            
-            # Footer
-            c.setFont("Helvetica", 9)
-            c.setFillColorRGB(0.6, 0.6, 0.6)
-            c.drawString(50, 30, f"{title} - Slide {idx + 1}/{len(slides)}")
-            c.drawRightString(width - 50, 30, datetime.now().strftime("%B %d, %Y"))
-        
-        c.save()
-        
-        # Read and return file
-        with open(pdf_path, 'rb') as f:
-            pdf_data = f.read()
-        
-        os.unlink(pdf_path)
-        
+            if slide.get('chartUrl'):
+                jobs.append((idx, "chart", slide['chartUrl']))
+            elif slide.get('imageUrl') and slide.get('layout', 'split') != 'full-text':
+                jobs.append((idx, "image", slide['imageUrl']))
+
+        media = await _download_export_media(slides, jobs)
+        # The builder's own buffer is streamed as-is — no second copy of
+        # the finished document
+        buffer = await asyncio.to_thread(_build_pdf, title, slides, media)
+
         return StreamingResponse(
-            io.BytesIO(pdf_data),
+            buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}.pdf"'
             }
         )
-        
+
     except Exception as e:
-        print(f"❌ PDF export error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("PDF export error")
         raise HTTPException(status_code=500, detail=f"PDF export failed: {str(e)}")
 
+
+_PPTX_ALIGN = {"center": PP_ALIGN.CENTER, "right": PP_ALIGN.RIGHT, "left": PP_ALIGN.LEFT}
+
+
+def _build_pptx(title: str, slides: list, media: list) -> io.BytesIO:
+    """Render the deck with python-pptx. Blocking — run off the event loop."""
+    prs = Presentation()
+    prs.slide_width = Inches(10)
+    prs.slide_height = Inches(7.5)
+
+    for idx, slide_data in enumerate(slides):
+        # Use blank layout
+        blank_layout = prs.slide_layouts[6]
+        slide = prs.slides.add_slide(blank_layout)
+
+        # Background color
+        background = slide.background
+        fill = background.fill
+        fill.solid()
+        bg_color = slide_data.get('backgroundColor', '#ffffff')
+        try:
+            r, g, b = hex_to_rgb(bg_color)
+            fill.fore_color.rgb = RGBColor(r, g, b)
+        except:
+            fill.fore_color.rgb = RGBColor(255, 255, 255)
+
+        layout = slide_data.get('layout', 'split')
+
+        # Title
+        title_box = slide.shapes.add_textbox(
+            Inches(0.5), Inches(0.5), Inches(9), Inches(1)
+        )
+        title_frame = title_box.text_frame
+        title_frame.word_wrap = True
+        p = title_frame.paragraphs[0]
+        p.text = slide_data.get('title', f'Slide {idx + 1}')
+        p.font.size = Pt(36)
+        p.font.bold = True
+
+        try:
+            text_color = slide_data.get('textColor', '#1f2937')
+            r, g, b = hex_to_rgb(text_color)
+            p.font.color.rgb = RGBColor(r, g, b)
+        except:
+            p.font.color.rgb = RGBColor(31, 41, 55)
+
+        # Per-slide invariants, computed once instead of per content line
+        text_align = slide_data.get('textAlign', 'left')
+        content_align = _PPTX_ALIGN.get(text_align, PP_ALIGN.LEFT)
+        p.alignment = content_align
+        try:
+            content_rgb = RGBColor(*hex_to_rgb(text_color))
+        except:
+            content_rgb = RGBColor(55, 65, 81)
+
+        # Content positioning based on layout
+        if layout == 'centered' or layout == 'center':
+            content_left = Inches(1.5)
+            content_top = Inches(2.5)
+            content_width = Inches(7)
+            content_height = Inches(4)
+        elif layout == 'full-text':
+            content_left = Inches(0.5)
+            content_top = Inches(2)
+            content_width = Inches(9)
+            content_height = Inches(5)
+        else:  # split or default
+            content_left = Inches(0.5)
+            content_top = Inches(2)
+            content_width = Inches(4.5)
+            content_height = Inches(5)
+
+        # Content
+        content_box = slide.shapes.add_textbox(
+            content_left, content_top, content_width, content_height
+        )
+        content_frame = content_box.text_frame
+        content_frame.word_wrap = True
+
+        content_text = slide_data.get('content', '')
+        content_lines = content_text.split('\n')
+
+        for line_idx, line in enumerate(content_lines[:15]):
+            if line_idx > 0:
+                content_frame.add_paragraph()
+            p = content_frame.paragraphs[line_idx]
+            p.text = line.strip()
+            p.font.size = Pt(18)
+            p.space_after = Pt(8)
+            p.font.color.rgb = content_rgb
+            p.alignment = content_align
+
+        # Chart (priority) — pre-downloaded
+        chart_bytes = media[idx]["chart"]
+        if chart_bytes:
+            try:
+                slide.shapes.add_picture(
+                    io.BytesIO(chart_bytes),
+                    Inches(1),
+                    Inches(2.5),
+                    width=Inches(8),
+                    height=Inches(4.5)
+                )
+            except Exception as e:
+                logger.warning("⚠️ PPTX chart error: %s", e)
+
+        # Image (only if no chart and layout supports it)
+        img_bytes = media[idx]["image"]
+        if img_bytes:
+            try:
+                slide.shapes.add_picture(
+                    io.BytesIO(img_bytes),
+                    Inches(5.5),
+                    Inches(2),
+                    width=Inches(4),
+                    height=Inches(5)
+                )
+            except Exception as e:
+                logger.warning("⚠️ PPTX image error: %s", e)
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
 async def export_as_pptx(title: str, slides: list, filename: str):
     """Export as PowerPoint file"""
     try:
-        prs = Presentation()
-        prs.slide_width = Inches(10)
-        prs.slide_height = Inches(7.5)
-        
+        jobs = []
         for idx, slide_data in enumerate(slides):
-            # Use blank layout
-            blank_layout = prs.slide_layouts[6]
-            slide = prs.slides.add_slide(blank_layout)
-            
-            # Background color
-            background = slide.background
-            fill = background.fill
-            fill.solid()
-            bg_color = slide_data.get('backgroundColor', '#ffffff')
-            try:
-                r, g, b = hex_to_rgb(bg_color)
-                fill.fore_color.rgb = RGBColor(r, g, b)
-            except:
-                fill.fore_color.rgb = RGBColor(255, 255, 255)
-            
-            layout = slide_data.get('layout', 'split')
-            
-            # Title
-            title_box = slide.shapes.add_textbox(
-                Inches(0.5), Inches(0.5), Inches(9), Inches(1)
-            )
-            title_frame = title_box.text_frame
-            title_frame.word_wrap = True
-            p = title_frame.paragraphs[0]
-            p.text = slide_data.get('title', f'Slide {idx + 1}')
-            p.font.size = Pt(36)
-            p.font.bold = True
-            
-            try:
-                text_color = slide_data.get('textColor', '#1f2937')
-                r, g, b = hex_to_rgb(text_color)
-                p.font.color.rgb = RGBColor(r, g, b)
-            except:
-                p.font.color.rgb = RGBColor(31, 41, 55)
-            
-            text_align = slide_data.get('textAlign', 'left')
-            if text_align == 'center':
-                p.alignment = PP_ALIGN.CENTER
-            elif text_align == 'right':
-                p.alignment = PP_ALIGN.RIGHT
-            else:
-                p.alignment = PP_ALIGN.LEFT
-            
-            # Content positioning based on layout
-            if layout == 'centered' or layout == 'center':
-                content_left = Inches(1.5)
-                content_top = Inches(2.5)
-                content_width = Inches(7)
-                content_height = Inches(4)
-            elif layout == 'full-text':
-                content_left = Inches(0.5)
-                content_top = Inches(2)
-                content_width = Inches(9)
-                content_height = Inches(5)
-            else:  # split or default
-                content_left = Inches(0.5)
-                content_top = Inches(2)
-                content_width = Inches(4.5)
-                content_height = Inches(5)
-            
-            # Content
-            content_box = slide.shapes.add_textbox(
-                content_left, content_top, content_width, content_height
-            )
-            content_frame = content_box.text_frame
-            content_frame.word_wrap = True
-            
-            content_text = slide_data.get('content', '')
-            content_lines = content_text.split('\n')
-            
-            for line_idx, line in enumerate(content_lines[:15]):
-                if line_idx > 0:
-                    content_frame.add_paragraph()
-                p = content_frame.paragraphs[line_idx]
-                p.text = line.strip()
-                p.font.size = Pt(18)
-                p.space_after = Pt(8)
-                
-                try:
-                    r, g, b = hex_to_rgb(text_color)
-                    p.font.color.rgb = RGBColor(r, g, b)
-                except:
-                    p.font.color.rgb = RGBColor(55, 65, 81)
-                
-                if text_align == 'center':
-                    p.alignment = PP_ALIGN.CENTER
-                elif text_align == 'right':
-                    p.alignment = PP_ALIGN.RIGHT
-                else:
-                    p.alignment = PP_ALIGN.LEFT
-            
-            # Chart (priority)
-            chart_url = slide_data.get('chartUrl')
-            if chart_url:
-                chart_path = download_image(chart_url)
-                if chart_path:
-                    try:
-                        slide.shapes.add_picture(
-                            chart_path,
-                            Inches(1),
-                            Inches(2.5),
-                            width=Inches(8),
-                            height=Inches(4.5)
-                        )
-                        os.unlink(chart_path)
-                    except Exception as e:
-                        print(f"⚠️ PPTX chart error: {e}")
-            
-            # Image (only if no chart and layout supports it)
-            elif layout not in ['full-text', 'centered', 'center']:
-                image_url = slide_data.get('imageUrl')
-                if image_url:
-                    img_path = download_image(image_url)
-                    if img_path:
-                        try:
-                            slide.shapes.add_picture(
-                                img_path,
-                                Inches(5.5),
-                                Inches(2),
-                                width=Inches(4),
-                                height=Inches(5)
-                            )
-                            os.unlink(img_path)
-                        except Exception as e:
-                            print(f"⚠️ PPTX image error: {e}")
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pptx') as tmp_file:
-            pptx_path = tmp_file.name
-        
-        prs.save(pptx_path)
-        
-        # Read and return
-        with open(pptx_path, 'rb') as f:
-            pptx_data = f.read()
-        
-        os.unlink(pptx_path)
-        
+            if slide_data.get('chartUrl'):
+                jobs.append((idx, "chart", slide_data['chartUrl']))
+            elif (slide_data.get('layout', 'split') not in ('full-text', 'centered', 'center')
+                  and slide_data.get('imageUrl')):
+                jobs.append((idx, "image", slide_data['imageUrl']))
+
+        media = await _download_export_media(slides, jobs)
+        buffer = await asyncio.to_thread(_build_pptx, title, slides, media)
+
         return StreamingResponse(
-            io.BytesIO(pptx_data),
+            buffer,
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}.pptx"'
             }
         )
-        
+
     except Exception as e:
-        print(f"❌ PPTX export error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("PPTX export error")
         raise HTTPException(status_code=500, detail=f"PPTX export failed: {str(e)}")
 
 # ============================================================================
@@ -1139,24 +1740,59 @@ async def export_as_pptx(title: str, slides: list, filename: str):
 # ============================================================================
 
 if os.path.exists("dist"):
-    app.mount("/static", StaticFiles(directory="dist"), name="static")
-    
+    app.mount("/static", ImmutableStaticFiles(directory="dist"), name="static")
+
+    # index.html is tiny and immutable between deploys — read it once and
+    # serve from memory instead of re-stat/re-open per SPA route hit
+    with open("dist/index.html", "rb") as f:
+        _INDEX_HTML = f.read()
+    _INDEX_ETAG = hashlib.blake2b(_INDEX_HTML, digest_size=8).hexdigest()
+
     @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
+    async def serve_spa(full_path: str, request: Request):
         """Serve the React app for any non-API routes"""
         if full_path.startswith("api/"):
             return {"error": "API endpoint not found"}
-        return FileResponse("dist/index.html")
+        if request.headers.get("if-none-match") == _INDEX_ETAG:
+            return Response(status_code=304)
+        return Response(
+            content=_INDEX_HTML,
+            media_type="text/html",
+            headers={"cache-control": "no-cache", "etag": _INDEX_ETAG}
+        )
 
 # ============================================================================
 # RUN SERVER
 # ============================================================================
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app", 
-        host="0.0.0.0", 
-        port=5000, 
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    if os.getenv("ENV") == "prod":
+        # Production: one worker per core, uvloop + httptools (both ship
+        # with uvicorn[standard]). Workers are incompatible with reload.
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=5000,
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+            loop="uvloop",
+            http="httptools",
+            log_level="warning"
+        )
+    else:
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass  # not available on Windows
+
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=5000,
+            reload=True,
+            log_level="info"
+        )
\ No newline at end of file
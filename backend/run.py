@@ -6,24 +6,57 @@ import uvicorn
 import os
 from dotenv import load_dotenv
 
+# Use uvloop when available (Linux/Mac) - noticeably faster for the
+# httpx-heavy async workload. Not available on Windows, so keep it optional.
+try:
+    import uvloop
+    uvloop.install()
+    print("uvloop event loop enabled")
+except ImportError:
+    pass
+
 # Load environment variables
 load_dotenv()
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 5000))
     host = os.getenv("HOST", "0.0.0.0")
-    reload = os.getenv("RELOAD", "true").lower() == "true"
-    
-    print(f"Starting Presentation AI API server...")
-    print(f"Host: {host}")
-    print(f"Port: {port}")
-    print(f"Reload: {reload}")
-    print(f"API Documentation: http://{host}:{port}/docs")
-    
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=reload,
-        log_level="info"
-    )
+
+    if os.getenv("ENV") in ("prod", "production"):
+        # Production: one worker per core unless WORKERS pins it, uvloop +
+        # httptools (both ship with uvicorn[standard]), and no reload — the
+        # file watcher burns CPU and is incompatible with workers. In-process
+        # caches are per worker by design; the export image cache lives on
+        # disk so workers share it.
+        workers = int(os.getenv("WORKERS", os.cpu_count() or 2))
+
+        print(f"Starting Presentation AI API server ({workers} workers)...")
+        print(f"Host: {host}")
+        print(f"Port: {port}")
+
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+            log_level="warning"
+        )
+    else:
+        reload = os.getenv("RELOAD", "true").lower() == "true"
+
+        print(f"Starting Presentation AI API server...")
+        print(f"Host: {host}")
+        print(f"Port: {port}")
+        print(f"Reload: {reload}")
+        print(f"API Documentation: http://{host}:{port}/docs")
+
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            log_level="info"
+        )
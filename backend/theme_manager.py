@@ -1,6 +1,6 @@
 import random
 from typing import Dict, List, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class Theme:
@@ -12,6 +12,11 @@ class Theme:
     text_color: str
     font_family: str
     image_style_keywords: List[str]
+    # Joined once here instead of on every slide the theme is applied to
+    style_suffix: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.style_suffix = ", ".join(self.image_style_keywords)
 
 class ThemeManager:
     """Manages themes and layout rules for Gamma-style presentations"""
@@ -19,6 +24,9 @@ class ThemeManager:
     def __init__(self):
         self.themes = self._initialize_themes()
         self.layout_templates = self._initialize_layout_templates()
+        # (theme name, layout type) -> ready-made slide patch; the same
+        # pairing recurs for every slide of a deck
+        self._patch_cache: Dict[tuple, Dict[str, Any]] = {}
     
     def _initialize_themes(self) -> Dict[str, Theme]:
         """Initialize built-in themes with style keywords"""
@@ -128,28 +136,38 @@ class ThemeManager:
             return self.layout_templates[layout_type]
         return random.choice(list(self.layout_templates.values()))
     
+    def _theme_layout_patch(self, theme: Theme, layout_type: str) -> Dict[str, Any]:
+        """Build (or reuse) the slide fields a theme+layout pairing sets"""
+        key = (theme.name, layout_type)
+        patch = self._patch_cache.get(key)
+        if patch is None:
+            layout = self.layout_templates[layout_type]
+            patch = {
+                "backgroundColor": theme.background_color,
+                "textColor": theme.text_color,
+                "primaryColor": theme.primary_color,
+                "secondaryColor": theme.secondary_color,
+                "accentColor": theme.accent_color,
+                "layout": layout["layout"],
+                "backgroundStyle": layout["background_style"],
+                "textAlignment": layout["text_alignment"],
+                "imagePosition": layout["image_position"],
+            }
+            self._patch_cache[key] = patch
+        return patch
+
     def apply_theme_to_slide(self, slide: Dict[str, Any], theme: Theme, layout_type: str = None) -> Dict[str, Any]:
         """Apply theme and layout to a slide"""
-        layout = self.get_layout_template(layout_type)
-        
-        # Apply theme colors
-        slide["backgroundColor"] = theme.background_color
-        slide["textColor"] = theme.text_color
-        slide["primaryColor"] = theme.primary_color
-        slide["secondaryColor"] = theme.secondary_color
-        slide["accentColor"] = theme.accent_color
-        
-        # Apply layout
-        slide["layout"] = layout["layout"]
-        slide["backgroundStyle"] = layout["background_style"]
-        slide["textAlignment"] = layout["text_alignment"]
-        slide["imagePosition"] = layout["image_position"]
-        
+        if layout_type not in self.layout_templates:
+            # Random layout per call — pick one, then reuse its patch
+            layout_type = random.choice(list(self.layout_templates.keys()))
+
+        slide.update(self._theme_layout_patch(theme, layout_type))
+
         # Add theme-specific image style keywords
         if "imagePrompt" in slide:
-            style_keywords = ", ".join(theme.image_style_keywords)
-            slide["imagePrompt"] = f"{slide['imagePrompt']}, {style_keywords}"
-        
+            slide["imagePrompt"] = f"{slide['imagePrompt']}, {theme.style_suffix}"
+
         return slide
     
     def get_available_themes(self) -> List[str]:
@@ -169,6 +187,8 @@ class ThemeManager:
             image_style_keywords=kwargs.get("image_style_keywords", ["professional", "clean"])
         )
         self.themes[name] = theme
+        # Drop any patches built from a theme this name replaced
+        self._patch_cache = {k: v for k, v in self._patch_cache.items() if k[0] != name}
         return theme
 
 # Global theme manager instance